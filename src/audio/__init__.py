@@ -3,8 +3,26 @@ Audio module for handling microphone input and speaker output.
 Optimized for ReSpeaker Mic Array v2.0 on Raspberry Pi 5.
 """
 
-from .microphone import Microphone
-from .speaker import Speaker
+from importlib import import_module
 
 __all__ = ["Microphone", "Speaker"]
 
+# Submodule providing each public name. Imported on first access (PEP 562),
+# so importing one submodule does not load its siblings' dependencies.
+_LAZY_IMPORTS = {
+    "Microphone": ".microphone",
+    "Speaker": ".speaker",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
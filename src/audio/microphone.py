@@ -17,11 +17,33 @@ import pyaudio
 import numpy as np
 import wave
 import logging
-from typing import Optional, Tuple
+import queue
+import re
+from typing import Callable, List, Optional, Tuple
 import time
 
 logger = logging.getLogger(__name__)
 
+# Chunks buffered between the capture callback and consumers. When full the
+# oldest chunk is dropped so a slow consumer never sees stale audio pile up
+# (raised to a whole recording while record_until_silence runs).
+CAPTURE_QUEUE_CHUNKS = 8
+
+# Seconds a consumer waits for a chunk before treating capture as stalled
+CHUNK_TIMEOUT = 2.0
+
+# Device name keywords for ReSpeaker auto-detection, earlier = higher priority
+RESPEAKER_KEYWORDS = (
+    "respeaker", "xmos", "usb pnp audio", "seeed",
+    "xvf3000", "usb audio", "mic array"
+)
+KEYWORD_PRIORITY = {keyword: len(RESPEAKER_KEYWORDS) - j
+                    for j, keyword in enumerate(RESPEAKER_KEYWORDS)}
+# One pass over a (lowercased) device name finds every keyword in it
+RESPEAKER_RE = re.compile("|".join(re.escape(keyword) for keyword in RESPEAKER_KEYWORDS))
+# Extra weight for names that are almost certainly the ReSpeaker (first match wins)
+RESPEAKER_BONUS = (("respeaker", 10), ("seeed", 8), ("xmos", 6))
+
 
 class Microphone:
     """
@@ -37,22 +59,35 @@ class Microphone:
     - Recording with automatic silence detection
     - USB device auto-detection for ReSpeaker
     - Support for 6-channel firmware (uses channel 0 for ASR)
+    - Callback-mode capture on PortAudio's own thread, so reading audio
+      never waits on the consumer's processing (wake word inference, VAD)
     """
     
+    # (index, info) for every input device, from the first PortAudio scan in
+    # this process; shared by all instances until invalidate_device_cache()
+    _device_cache: Optional[List[Tuple[int, dict]]] = None
+    
     def __init__(self, sample_rate: int = 16000, channels: int = 1, 
-                 chunk_size: int = 1024, device_name: Optional[str] = None):
+                 chunk_size: int = 1280, device_name: Optional[str] = None,
+                 chunk_ms: Optional[float] = None):
         """
         Initialize the microphone.
         
         Args:
             sample_rate: Audio sample rate in Hz (default: 16000, max for ReSpeaker)
             channels: Number of audio channels (default: 1 for mono, channel 0)
-            chunk_size: Size of audio chunks to read (default: 1024)
+            chunk_size: Size of audio chunks to read (default: 1280, one
+                        80 ms OpenWakeWord frame at 16kHz)
             device_name: Device name keyword to search for (e.g., "ReSpeaker", "XMOS")
                         If None, will auto-detect ReSpeaker or use default device
+            chunk_ms: Optional chunk length in milliseconds; overrides chunk_size
+                      (e.g. 20-30 ms for low latency on a fast host, 80-160 ms
+                      on a Pi, where per-chunk overhead dominates)
         """
         self.sample_rate = sample_rate
         self.channels = channels
+        if chunk_ms is not None:
+            chunk_size = max(1, int(sample_rate * chunk_ms / 1000))
         self.chunk_size = chunk_size
         self.device_name = device_name
         
@@ -60,11 +95,54 @@ class Microphone:
         self.stream: Optional[pyaudio.Stream] = None
         self.device_index = self._find_device_index()
         
-        logger.info(f"Microphone initialized: {sample_rate}Hz, {channels} channel(s)")
+        # Producer/consumer hand-off between the stream callback and readers
+        # Unbounded queue; the callback enforces _queue_limit itself so the
+        # limit can be raised for the length of a recording
+        self._chunks: queue.Queue = queue.Queue()
+        self._queue_limit = CAPTURE_QUEUE_CHUNKS
+        # Chunks the callback has dropped because nobody was reading
+        self._dropped_total = 0
+        self._dropping = False  # Inside a run of drops (warn once per run)
+        # Recording buffer kept across record_until_silence() calls; only
+        # reallocated when a longer max_duration needs more room
+        self._record_buffer = np.empty(0, dtype=np.int16)
+        # Reusable |x| scratch for the silence check (uint16 holds |-32768|)
+        self._abs_buf = np.empty(0, dtype=np.uint16)
+        
+        logger.info(f"Microphone initialized: {sample_rate}Hz, {channels} channel(s), "
+                   f"{self.chunk_size}-sample chunks")
         if self.device_index is not None:
-            device_info = self.audio.get_device_info_by_index(self.device_index)
+            device_info = dict(self._enumerate_devices()).get(self.device_index, {})
             logger.info(f"Using device: {device_info.get('name')}")
         
+    @classmethod
+    def invalidate_device_cache(cls) -> None:
+        """Forget the cached device scan (e.g. after a USB mic is plugged in)."""
+        cls._device_cache = None
+        
+    def _enumerate_devices(self) -> List[Tuple[int, dict]]:
+        """
+        List the audio input devices, querying PortAudio only once.
+        
+        Enumerating USB audio devices can take hundreds of milliseconds, so
+        the result is cached at class level.
+        
+        Returns:
+            List of (device index, device info) for devices with inputs
+        """
+        if Microphone._device_cache is None:
+            devices = []
+            for i in range(self.audio.get_device_count()):
+                try:
+                    info = self.audio.get_device_info_by_index(i)
+                except Exception as e:
+                    logger.debug(f"Error checking device {i}: {e}")
+                    continue
+                if info.get('maxInputChannels', 0) > 0:
+                    devices.append((i, info))
+            Microphone._device_cache = devices
+        return Microphone._device_cache
+        
     def _find_device_index(self) -> Optional[int]:
         """
         Find the device index for ReSpeaker USB device.
@@ -77,44 +155,30 @@ class Microphone:
         """
         # Auto-detect ReSpeaker if no specific name given
         if self.device_name is None:
-            # Enhanced keywords for better detection on Raspberry Pi
-            respeaker_keywords = [
-                "respeaker", "xmos", "usb pnp audio", "seeed", 
-                "xvf3000", "usb audio", "mic array"
-            ]
-            
             # Store potential matches with priority
             potential_devices = []
+            input_devices = self._enumerate_devices()
             
             logger.info("Scanning for audio input devices...")
-            for i in range(self.audio.get_device_count()):
+            for i, info in input_devices:
                 try:
-                    info = self.audio.get_device_info_by_index(i)
                     device_name = info.get('name', '').lower()
                     max_input_channels = info.get('maxInputChannels', 0)
                     
-                    # Skip output-only devices
-                    if max_input_channels == 0:
-                        continue
-                    
                     logger.debug(f"Device {i}: {info.get('name')} - {max_input_channels} input channels")
                     
                     # Check for ReSpeaker identifiers with priority
-                    priority = 0
-                    for j, keyword in enumerate(respeaker_keywords):
-                        if keyword in device_name:
-                            priority = len(respeaker_keywords) - j  # Higher priority for earlier keywords
-                            break
+                    found = set(RESPEAKER_RE.findall(device_name))
+                    priority = max((KEYWORD_PRIORITY[keyword] for keyword in found), default=0)
                     
                     # Special handling for common ReSpeaker device names
-                    if "respeaker" in device_name:
-                        priority += 10
-                    elif "seeed" in device_name:
-                        priority += 8
-                    elif "xmos" in device_name:
-                        priority += 6
-                    elif max_input_channels >= 4:  # Multi-channel devices are likely ReSpeaker
-                        priority += 2
+                    for keyword, bonus in RESPEAKER_BONUS:
+                        if keyword in found:
+                            priority += bonus
+                            break
+                    else:
+                        if max_input_channels >= 4:  # Multi-channel devices are likely ReSpeaker
+                            priority += 2
                     
                     if priority > 0:
                         potential_devices.append((priority, i, info))
@@ -134,22 +198,17 @@ class Microphone:
             
             logger.warning("No ReSpeaker device found, checking for any suitable input device...")
             
-            # Fallback: find any input device with sufficient channels
-            for i in range(self.audio.get_device_count()):
-                try:
-                    info = self.audio.get_device_info_by_index(i)
-                    if info.get('maxInputChannels', 0) >= 1:
-                        logger.info(f"Using fallback device: {info.get('name')} (index: {i})")
-                        return i
-                except:
-                    continue
+            # Fallback: use the first input device
+            if input_devices:
+                i, info = input_devices[0]
+                logger.info(f"Using fallback device: {info.get('name')} (index: {i})")
+                return i
             
             logger.info("No suitable audio input device found, using system default")
             return None
         
         # Search for user-specified device name
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
+        for i, info in self._enumerate_devices():
             device_name = info.get('name', '').lower()
             
             # Check if this is the target device
@@ -180,7 +239,7 @@ class Microphone:
                 'format': pyaudio.paInt16,
                 'channels': 1,  # Force mono
                 'rate': 16000,  # Force 16kHz
-                'frames_per_buffer': 1024  # Smaller buffer
+                'frames_per_buffer': 1280  # Smaller buffer, one wake word frame
             },
             # More conservative configuration
             {
@@ -209,7 +268,7 @@ class Microphone:
                     input=True,
                     input_device_index=self.device_index,
                     frames_per_buffer=config['frames_per_buffer'],
-                    stream_callback=None
+                    stream_callback=self._on_audio
                 )
                 
                 # Update instance variables if different config was used
@@ -244,18 +303,77 @@ class Microphone:
             
         raise RuntimeError(f"Unable to start audio stream: {last_error}")
             
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """Producer: PortAudio stream callback handing each buffer to consumers."""
+        if status:
+            logger.debug("Audio input status flags: %s", status)
+            
+        # Consumer fell behind: drop the oldest chunks to bound latency
+        while self._chunks.qsize() >= self._queue_limit:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                break
+            self._dropped_total += 1
+            if not self._dropping:
+                self._dropping = True
+                logger.warning("Audio capture queue full; dropping the oldest "
+                               "audio until it is read")
+        self._chunks.put_nowait(in_data)
+            
+        return (None, pyaudio.paContinue)
+        
+    def _next_chunk(self) -> Optional[bytes]:
+        """Consumer: take the next captured chunk, or None if capture stalled."""
+        try:
+            chunk = self._chunks.get(timeout=CHUNK_TIMEOUT)
+        except queue.Empty:
+            logger.error(f"No audio received for {CHUNK_TIMEOUT:.1f}s")
+            return None
+        self._dropping = False
+        return chunk
+        
+    def discard_pending(self) -> int:
+        """
+        Throw away audio captured but not yet read, keeping the stream open.
+        
+        Call at the start of each capture phase so it begins with live audio
+        rather than whatever queued up while the robot was speaking or busy.
+        
+        Returns:
+            Number of chunks discarded
+        """
+        discarded = 0
+        while True:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                break
+            discarded += 1
+        self._dropping = False
+        if discarded:
+            logger.debug(f"Discarded {discarded} stale audio chunk(s)")
+        return discarded
+            
     def stop_stream(self) -> None:
         """Stop the audio input stream."""
         if self.stream is not None:
+            # Stops the callback before the queue is drained below
             self.stream.stop_stream()
             self.stream.close()
             self.stream = None
             logger.info("Audio stream stopped")
             
+        # Discard audio left over from this stream
+        self.discard_pending()
+            
     def read_chunk(self) -> Optional[bytes]:
         """
         Read a single chunk of audio data.
         
+        Blocks until chunk_size frames are available, so callers can use it
+        to pace a capture loop at the stream's real-time rate without sleeping.
+        
         Returns:
             Audio data as bytes, or None if stream not active
         """
@@ -263,16 +381,12 @@ class Microphone:
             logger.error("Stream not started")
             return None
             
-        try:
-            data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-            return data
-        except Exception as e:
-            logger.error(f"Error reading audio chunk: {e}")
-            return None
+        return self._next_chunk()
             
     def record_until_silence(self, silence_threshold: int = 500, 
                             silence_duration: float = 1.5,
-                            max_duration: float = 10.0) -> Optional[bytes]:
+                            max_duration: float = 10.0,
+                            on_chunk: Optional[Callable[[bytes], None]] = None) -> Optional[bytes]:
         """
         Record audio until silence is detected or max duration reached.
         
@@ -280,6 +394,8 @@ class Microphone:
             silence_threshold: Amplitude threshold for silence detection
             silence_duration: Seconds of silence before stopping
             max_duration: Maximum recording duration in seconds
+            on_chunk: Optional callback given each chunk as it is captured
+                     (e.g. a streaming recognizer's accept_chunk)
             
         Returns:
             Recorded audio as bytes, or None if error
@@ -288,40 +404,82 @@ class Microphone:
             logger.error("Stream not started")
             return None
             
+        # Record from now on, not from audio queued before the call
+        self.discard_pending()
+        
         logger.info("Recording started...")
-        frames = []
         silent_chunks = 0
-        chunks_per_silence = int(self.sample_rate / self.chunk_size * silence_duration)
+        chunks_per_silence = max(1, int(self.sample_rate / self.chunk_size * silence_duration))
         max_chunks = int(self.sample_rate / self.chunk_size * max_duration)
         
-        start_time = time.time()
+        # Samples are copied straight into one contiguous buffer sized for the
+        # longest recording, instead of keeping every chunk and joining them
+        buffer_size = max_chunks * self.chunk_size * self.channels
+        if self._record_buffer.shape[0] < buffer_size:
+            self._record_buffer = np.empty(buffer_size, dtype=np.int16)
+        buffer = self._record_buffer[:buffer_size]
+        recorded = 0  # Samples written so far
+        num_chunks = 0
+        
+        # Monotonic clock: immune to NTP/wall-clock jumps on the Pi
+        start_time = time.monotonic()
+        
+        # on_chunk (e.g. streaming decode) may fall behind real time; let the
+        # queue hold the whole recording meanwhile instead of dropping speech
+        self._queue_limit = max(CAPTURE_QUEUE_CHUNKS, max_chunks)
+        dropped_before = self._dropped_total
         
         try:
             for _ in range(max_chunks):
-                data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                frames.append(data)
+                data = self._next_chunk()
+                if data is None:
+                    break
+                    
+                chunk = np.frombuffer(data, dtype=np.int16)
+                end = recorded + len(chunk)
+                if end > len(buffer):
+                    break
+                audio_data = buffer[recorded:end]
+                audio_data[:] = chunk
+                recorded = end
+                num_chunks += 1
                 
-                # Calculate audio amplitude for VAD
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                amplitude = np.abs(audio_data).mean()
+                if on_chunk is not None:
+                    on_chunk(data)
                 
-                if amplitude < silence_threshold:
-                    silent_chunks += 1
-                    if silent_chunks >= chunks_per_silence:
-                        logger.info(f"Silence detected after {time.time() - start_time:.2f}s")
-                        break
-                else:
-                    silent_chunks = 0
+                # VAD: mean |x| < threshold, compared as integer sums so
+                # there is no float divide and no per-chunk temporary
+                if self._abs_buf.shape[0] != audio_data.shape[0]:
+                    self._abs_buf = np.empty(audio_data.shape[0], dtype=np.uint16)
+                np.abs(audio_data, out=self._abs_buf, casting='unsafe')
+                level = int(self._abs_buf.sum(dtype=np.int64))
+                
+                # Length of the current run of quiet chunks (reset by sound)
+                is_silent = level < silence_threshold * audio_data.shape[0]
+                silent_chunks = silent_chunks + 1 if is_silent else 0
+                if silent_chunks >= chunks_per_silence:
+                    logger.info(f"Silence detected after {time.monotonic() - start_time:.2f}s")
+                    break
                     
-            duration = time.time() - start_time
-            logger.info(f"Recording finished: {duration:.2f}s, {len(frames)} chunks")
+            duration = time.monotonic() - start_time
+            logger.info(f"Recording finished: {duration:.2f}s, {num_chunks} chunks")
+            
+            lost = self._dropped_total - dropped_before
+            if lost:
+                logger.warning(f"Recording lost {lost} audio chunk(s) to a full capture queue")
             
-            return b''.join(frames)
+            if recorded == 0:
+                return None
+            return buffer[:recorded].tobytes()
             
         except Exception as e:
             logger.error(f"Error during recording: {e}")
             return None
             
+        finally:
+            # Back to a short queue (latency bound) between recordings
+            self._queue_limit = CAPTURE_QUEUE_CHUNKS
+            
     def save_audio(self, audio_data: bytes, filename: str) -> bool:
         """
         Save audio data to a WAV file.
@@ -348,11 +506,9 @@ class Microphone:
     def list_devices(self) -> None:
         """List all available audio input devices."""
         logger.info("Available audio input devices:")
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
-            if info.get('maxInputChannels', 0) > 0:
-                logger.info(f"  [{i}] {info.get('name')} - "
-                          f"{info.get('maxInputChannels')} channels")
+        for i, info in self._enumerate_devices():
+            logger.info(f"  [{i}] {info.get('name')} - "
+                      f"{info.get('maxInputChannels')} channels")
                           
     def close(self) -> None:
         """Clean up resources."""
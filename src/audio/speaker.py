@@ -4,12 +4,18 @@ Manages audio playback through the system
 """
 
 import pyaudio
+import numpy as np
 import wave
 import logging
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Clips up to this many bytes are written to the stream in one call
+SINGLE_WRITE_BYTES = 64 * 1024
+# Block size for streaming longer clips
+PLAYBACK_BLOCK_BYTES = 16 * 1024
+
 
 class Speaker:
     """
@@ -55,17 +61,37 @@ class Speaker:
                     output_device_index=self.device_index
                 )
                 
-                # Read and play audio in chunks
-                chunk_size = 1024
-                data = wf.readframes(chunk_size)
-                
-                while data:
-                    stream.write(data)
-                    data = wf.readframes(chunk_size)
+                try:
+                    frame_bytes = wf.getsampwidth() * wf.getnchannels()
+                    total_bytes = wf.getnframes() * frame_bytes
+                    single_write = total_bytes <= SINGLE_WRITE_BYTES
+                    
+                    # Volume is applied in software to 16-bit PCM, into one
+                    # scratch buffer reused for every block
+                    volume = max(0.0, min(1.0, volume))
+                    scratch = None
+                    if volume < 1.0:
+                        if wf.getsampwidth() == 2:
+                            block_bytes = total_bytes if single_write else PLAYBACK_BLOCK_BYTES
+                            scratch = np.empty(block_bytes // 2, dtype=np.int16)
+                        else:
+                            logger.warning("Volume control needs 16-bit WAV; playing at full volume")
                     
-                # Clean up
-                stream.stop_stream()
-                stream.close()
+                    if single_write:
+                        # Short clip (beeps, confirmations): one read, one write
+                        data = wf.readframes(wf.getnframes())
+                        stream.write(self._apply_volume(data, volume, scratch))
+                    else:
+                        # Longer clip: stream it in 16 KB blocks
+                        block_frames = max(1, PLAYBACK_BLOCK_BYTES // frame_bytes)
+                        data = wf.readframes(block_frames)
+                        while data:
+                            stream.write(self._apply_volume(data, volume, scratch))
+                            data = wf.readframes(block_frames)
+                finally:
+                    # Clean up
+                    stream.stop_stream()
+                    stream.close()
                 
             logger.info(f"Played audio file: {filename}")
             return True
@@ -77,6 +103,27 @@ class Speaker:
             logger.error(f"Error playing audio: {e}")
             return False
             
+    @staticmethod
+    def _apply_volume(data: bytes, volume: float, scratch: Optional[np.ndarray]) -> bytes:
+        """
+        Scale 16-bit PCM samples by volume.
+        
+        Args:
+            data: Raw int16 audio bytes
+            volume: Volume level (0.0 to 1.0)
+            scratch: int16 buffer at least as long as data, or None to
+                     return data unchanged
+            
+        Returns:
+            Scaled audio bytes
+        """
+        if scratch is None:
+            return data
+        samples = np.frombuffer(data, dtype=np.int16)
+        out = scratch[:samples.shape[0]]
+        np.multiply(samples, volume, out=out, casting='unsafe')
+        return out.tobytes()
+        
     def list_devices(self) -> None:
         """List all available audio output devices."""
         logger.info("Available audio output devices:")
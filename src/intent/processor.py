@@ -5,11 +5,37 @@ Extracts intents and entities from spoken text
 
 import re
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Pattern, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Number words to digits, checked in this order
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'a': 1, 'an': 1
+}
+
+# Quantity patterns, compiled once at import
+NUMBER_WORD_PATTERNS = [(re.compile(rf'\b{word}\b'), num) for word, num in NUMBER_WORDS.items()]
+DIGIT_PATTERN = re.compile(r'\b(\d+)\b')
+
+# Modifiers picked out of an utterance by _extract_modifiers
+SIZE_MODIFIERS = ['small', 'medium', 'large', 'extra large']
+COMMON_MODIFIERS = ['no ice', 'extra', 'with', 'without', 'hot', 'cold', 'iced']
+
+# Glue words customers say around items and triggers; only needed so a
+# grammar-restricted recognizer (see vocabulary()) can still hear them
+FILLER_WORDS = [
+    'i', "i'm", 'me', 'my', 'you', 'the', 'and', 'of', 'to', 'some', 'please',
+    'thanks', 'thank you', 'is', 'it', 'that', 'this', 'in', 'for', 'like',
+    'would', 'have', 'can',
+]
+
+# Pulls the alternatives out of a "\b(alt1|alt2|...)" intent pattern
+TRIGGER_GROUP_PATTERN = re.compile(r'^\\b\(([^()]*)\)')
+
 
 class Intent(Enum):
     """Customer intent types."""
@@ -33,19 +59,44 @@ class IntentProcessor:
     - Simple rule-based NLU (no ML required)
     """
     
-    def __init__(self):
-        """Initialize the intent processor."""
+    def __init__(self, menu_items: Optional[List[str]] = None):
+        """
+        Initialize the intent processor.
+        
+        Args:
+            menu_items: Known menu item names, indexed once up front
+        """
         self.intent_patterns = self._build_patterns()
+        # (name, lowercase name, words of multi-word names) per menu item
+        self._menu_index: List[Tuple[str, str, List[str]]] = []
+        self._menu_source: Optional[List[str]] = None
+        if menu_items is not None:
+            self.set_menu_items(menu_items)
         logger.info("Intent processor initialized")
         
-    def _build_patterns(self) -> Dict[Intent, List[str]]:
+    def set_menu_items(self, menu_items: List[str]) -> None:
+        """
+        Index menu item names for matching.
+        
+        Args:
+            menu_items: List of known menu item names
+        """
+        index = []
+        for item in menu_items:
+            item_lower = item.lower()
+            item_words = item_lower.split()
+            index.append((item, item_lower, item_words if len(item_words) > 1 else []))
+        self._menu_index = index
+        self._menu_source = menu_items
+        
+    def _build_patterns(self) -> Dict[Intent, List[Pattern]]:
         """
-        Build regex patterns for intent recognition.
+        Build regex patterns for intent recognition, compiled once.
         
         Returns:
-            Dictionary mapping intents to regex patterns
+            Dictionary mapping intents to compiled regex patterns
         """
-        return {
+        patterns = {
             Intent.ORDER: [
                 r'\b(i want|i would like|i\'ll have|give me|can i have|may i have)\b',
                 r'\b(order|get|take)\b',
@@ -74,14 +125,45 @@ class IntentProcessor:
                 r'\b(ready|checkout|pay)\b',
             ],
         }
+        return {
+            intent: [re.compile(pattern, re.IGNORECASE) for pattern in intent_patterns]
+            for intent, intent_patterns in patterns.items()
+        }
+        
+    def vocabulary(self) -> List[str]:
+        """
+        List every word and phrase this processor reacts to.
+        
+        Taken from the compiled intent patterns themselves plus the number
+        words and modifiers, so a speech grammar built from it (together
+        with the menu item names) cannot drift from what is recognized here.
+        
+        Returns:
+            Sorted list of unique lowercase phrases
+        """
+        phrases = set(NUMBER_WORDS) | set(SIZE_MODIFIERS) | set(COMMON_MODIFIERS)
+        phrases.update(FILLER_WORDS)
+        
+        for patterns in self.intent_patterns.values():
+            for pattern in patterns:
+                match = TRIGGER_GROUP_PATTERN.match(pattern.pattern)
+                if match is None:
+                    logger.warning(f"Cannot extract trigger words from pattern: {pattern.pattern}")
+                    continue
+                for phrase in match.group(1).split('|'):
+                    phrases.add(phrase.replace("\\'", "'"))
+                    
+        return sorted(phrases)
         
-    def process(self, text: str, menu_items: List[str]) -> Dict[str, Any]:
+    def process(self, text: str, menu_items: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Process spoken text to extract intent and entities.
         
         Args:
             text: Spoken text from ASR
-            menu_items: List of known menu item names
+            menu_items: List of known menu item names; only re-indexed when a
+                        different list than last time is passed (e.g. after
+                        a menu reload)
             
         Returns:
             Dictionary with intent, entities, and confidence
@@ -94,6 +176,9 @@ class IntentProcessor:
                 'raw_text': text
             }
             
+        if menu_items is not None and menu_items is not self._menu_source:
+            self.set_menu_items(menu_items)
+            
         text_lower = text.lower().strip()
         
         # Detect intent
@@ -101,7 +186,7 @@ class IntentProcessor:
         
         # Extract entities
         entities = {
-            'items': self._extract_items(text_lower, menu_items),
+            'items': self._extract_items(text_lower),
             'quantity': self._extract_quantity(text_lower),
             'modifiers': self._extract_modifiers(text_lower)
         }
@@ -137,7 +222,7 @@ class IntentProcessor:
         for intent, patterns in self.intent_patterns.items():
             score = 0
             for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
+                if pattern.search(text):
                     score += 1
             intent_scores[intent] = score
             
@@ -150,32 +235,27 @@ class IntentProcessor:
         # Default to ORDER if we can't determine intent
         return Intent.UNKNOWN
         
-    def _extract_items(self, text: str, menu_items: List[str]) -> List[str]:
+    def _extract_items(self, text: str) -> List[str]:
         """
         Extract menu items mentioned in text.
         
         Args:
             text: Lowercase text
-            menu_items: List of known menu item names
             
         Returns:
             List of found menu items
         """
         found_items = []
         
-        for item in menu_items:
-            item_lower = item.lower()
-            
+        for item, item_lower, item_words in self._menu_index:
             # Check for exact match
             if item_lower in text:
                 found_items.append(item)
                 continue
                 
-            # Check for word match (all words present)
-            item_words = item_lower.split()
-            if len(item_words) > 1:
-                if all(word in text for word in item_words):
-                    found_items.append(item)
+            # Check for word match (all words present, multi-word names only)
+            if item_words and all(word in text for word in item_words):
+                found_items.append(item)
                     
         return found_items
         
@@ -189,20 +269,13 @@ class IntentProcessor:
         Returns:
             Quantity (default: 1)
         """
-        # Number words to digits
-        number_words = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
-            'a': 1, 'an': 1
-        }
-        
         # Check for number words
-        for word, num in number_words.items():
-            if re.search(rf'\b{word}\b', text):
+        for pattern, num in NUMBER_WORD_PATTERNS:
+            if pattern.search(text):
                 return num
                 
         # Check for digits
-        digit_match = re.search(r'\b(\d+)\b', text)
+        digit_match = DIGIT_PATTERN.search(text)
         if digit_match:
             return int(digit_match.group(1))
             
@@ -222,16 +295,12 @@ class IntentProcessor:
         modifiers = []
         
         # Size modifiers
-        sizes = ['small', 'medium', 'large', 'extra large']
-        for size in sizes:
+        for size in SIZE_MODIFIERS:
             if size in text:
                 modifiers.append(size)
                 
         # Common modifiers
-        common_modifiers = [
-            'no ice', 'extra', 'with', 'without', 'hot', 'cold', 'iced'
-        ]
-        for mod in common_modifiers:
+        for mod in COMMON_MODIFIERS:
             if mod in text:
                 modifiers.append(mod)
                 
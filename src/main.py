@@ -5,10 +5,20 @@ Orchestrates all components: wake word, ASR, intent, menu, order, TTS
 
 import sys
 import logging
+import logging.handlers
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 import signal
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
+
+try:
+    # libyaml-backed loader: same safe subset, parsed in C
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -21,12 +31,20 @@ from src.menu.manager import MenuManager
 from src.intent.processor import IntentProcessor, Intent
 from src.order.manager import OrderManager
 
-# Configure logging
+# Runtime directories, created before the log handler below needs logs/
+RUNTIME_DIRS = ("logs", "data/orders", "models")
+for runtime_dir in RUNTIME_DIRS:
+    Path(runtime_dir).mkdir(parents=True, exist_ok=True)
+
+# Configure logging (the log file is opened on first write and rotated
+# so long sessions cannot fill the Pi's SD card)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/robot.log'),
+        logging.handlers.RotatingFileHandler(
+            'logs/robot.log', maxBytes=1_000_000, backupCount=3, delay=True
+        ),
         logging.StreamHandler()
     ]
 )
@@ -68,6 +86,15 @@ class DigitalWaiterRobot:
         self.intent_processor: Optional[IntentProcessor] = None
         self.order_manager: Optional[OrderManager] = None
         
+        # Replies are spoken on a worker thread so the main loop can keep
+        # going; wait_for_speech() blocks until they have all been said
+        self._tts_queue: queue.Queue = queue.Queue()
+        self._tts_thread: Optional[threading.Thread] = None
+        
+        # (name, close function) for each component actually constructed,
+        # closed in reverse order by stop()
+        self._components: List[Tuple[str, Callable[[], None]]] = []
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -78,7 +105,7 @@ class DigitalWaiterRobot:
         """Load configuration from YAML file."""
         try:
             with open(self.config_file, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
             logger.info(f"Configuration loaded from: {self.config_file}")
             return config
         except Exception as e:
@@ -98,18 +125,33 @@ class DigitalWaiterRobot:
         Returns:
             True if successful, False otherwise
         """
+        # Loading the Vosk model dominates start-up; do it on a worker thread
+        # so it overlaps the microphone, wake word, TTS and menu setup
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr-load")
+        recognizer_future = None
         try:
             # Audio configuration
             audio_config = self.config.get('audio', {})
             
+            # Start loading the speech recognizer
+            logger.info("Initializing speech recognizer (in background)...")
+            asr_config = self.config.get('asr', {})
+            recognizer_future = loader.submit(
+                SpeechRecognizer,
+                model_path=asr_config.get('model_path', 'models/vosk-model-small-en-us-0.15'),
+                sample_rate=audio_config.get('sample_rate', 16000)
+            )
+            
             # Initialize microphone
             logger.info("Initializing microphone...")
             self.microphone = Microphone(
                 sample_rate=audio_config.get('sample_rate', 16000),
                 channels=audio_config.get('channels', 1),
-                chunk_size=audio_config.get('chunk_size', 1024),
-                device_name=audio_config.get('device_name')
+                chunk_size=audio_config.get('chunk_size', 2560),
+                device_name=audio_config.get('device_name'),
+                chunk_ms=audio_config.get('chunk_ms')
             )
+            self._components.append(("microphone", self.microphone.close))
             
             # Initialize wake word detector
             if self.config.get('wake_word', {}).get('enabled', True):
@@ -117,16 +159,13 @@ class DigitalWaiterRobot:
                 wake_config = self.config.get('wake_word', {})
                 self.wake_word_detector = WakeWordDetector(
                     model_name=wake_config.get('model', 'hey_jarvis'),
-                    threshold=wake_config.get('threshold', 0.5)
+                    threshold=wake_config.get('threshold', 0.5),
+                    silence_threshold=wake_config.get('silence_threshold', 0),
+                    silence_hangover=wake_config.get('silence_hangover', 2),
+                    model_path=wake_config.get('model_path'),
+                    inference_framework=wake_config.get('inference_framework', 'tflite')
                 )
-            
-            # Initialize speech recognizer
-            logger.info("Initializing speech recognizer...")
-            asr_config = self.config.get('asr', {})
-            self.speech_recognizer = SpeechRecognizer(
-                model_path=asr_config.get('model_path', 'models/vosk-model-small-en-us-0.15'),
-                sample_rate=audio_config.get('sample_rate', 16000)
-            )
+                self._components.append(("wake word detector", self.wake_word_detector.close))
             
             # Initialize speech synthesizer
             logger.info("Initializing speech synthesizer...")
@@ -134,8 +173,17 @@ class DigitalWaiterRobot:
             self.speech_synthesizer = SpeechSynthesizer(
                 rate=tts_config.get('rate', 150),
                 volume=tts_config.get('volume', 0.9),
-                voice_id=tts_config.get('voice')
+                voice_id=tts_config.get('voice'),
+                # The engine is created by the TTS worker on first use, so it
+                # lives on the thread that drives it
+                lazy_init=True
+            )
+            self._components.append(("speech synthesizer", self.speech_synthesizer.close))
+            self._tts_thread = threading.Thread(
+                target=self._tts_worker, name="tts", daemon=True
             )
+            self._tts_thread.start()
+            self._components.append(("TTS worker", self._stop_tts_worker))
             
             # Initialize menu manager
             logger.info("Initializing menu manager...")
@@ -144,9 +192,23 @@ class DigitalWaiterRobot:
                 menu_file=menu_config.get('file', 'config/menu.yaml')
             )
             
+            # Wait for the background load (re-raises its exception, if any)
+            self.speech_recognizer = recognizer_future.result()
+            self._components.append(("speech recognizer", self.speech_recognizer.close))
+            
             # Initialize intent processor
             logger.info("Initializing intent processor...")
-            self.intent_processor = IntentProcessor()
+            self.intent_processor = IntentProcessor(
+                menu_items=self.menu_manager.get_item_names()
+            )
+            
+            # Menu-only grammar for fast decoding: menu item names plus the
+            # intent processor's own trigger vocabulary. listen_for_order
+            # falls back to the full recognizer for anything outside it
+            if asr_config.get('use_grammar', False):
+                self.speech_recognizer.set_grammar(
+                    self.menu_manager.get_item_names() + self.intent_processor.vocabulary()
+                )
             
             # Initialize order manager
             logger.info("Initializing order manager...")
@@ -161,21 +223,82 @@ class DigitalWaiterRobot:
             
         except Exception as e:
             logger.error(f"Failed to initialize components: {e}")
+            # Don't wait for (or leak) a recognizer nobody will use: cancel
+            # the load if it has not started, else close it once it finishes
+            if recognizer_future is not None and not recognizer_future.cancel():
+                recognizer_future.add_done_callback(self._close_abandoned_recognizer)
             return False
             
+        finally:
+            loader.shutdown(wait=False, cancel_futures=True)
+            
+    def _close_abandoned_recognizer(self, future) -> None:
+        """Close a background-loaded recognizer after start-up failed."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        recognizer = future.result()
+        # Already registered in _components (failure came later): stop() closes it
+        if recognizer is not self.speech_recognizer:
+            recognizer.close()
+            
+    def _tts_worker(self) -> None:
+        """
+        Speak queued replies in order until a None sentinel arrives.
+        
+        The synthesizer is lazy, so its pyttsx3 engine is created, used and
+        closed on this thread only.
+        """
+        while True:
+            text = self._tts_queue.get()
+            try:
+                if text is None:
+                    # Tear the engine down on the thread that created it
+                    if self.speech_synthesizer:
+                        self.speech_synthesizer.close()
+                    return
+                if self.speech_synthesizer:
+                    self.speech_synthesizer.speak(text)
+            except Exception as e:
+                logger.error(f"Error in TTS worker: {e}")
+            finally:
+                self._tts_queue.task_done()
+                
     def speak(self, text: str) -> None:
         """
-        Speak text through TTS.
+        Queue text to be spoken through TTS.
+        
+        Returns immediately; call wait_for_speech() before listening so
+        the robot does not hear itself.
         
         Args:
             text: Text to speak
         """
         if self.speech_synthesizer:
             logger.info(f"Robot: {text}")
-            self.speech_synthesizer.speak(text)
+            if self._tts_thread is not None and self._tts_thread.is_alive():
+                self._tts_queue.put(text)
+            else:
+                self.speech_synthesizer.speak(text)
         else:
             logger.warning("TTS not initialized")
             
+    def wait_for_speech(self) -> None:
+        """
+        Block until every queued reply has been spoken, then discard the
+        audio the microphone captured meanwhile so the robot never hears
+        (or wakes on) its own voice.
+        """
+        if self._tts_thread is not None and self._tts_thread.is_alive():
+            self._tts_queue.join()
+        if self.microphone:
+            self.microphone.discard_pending()
+            
+    def _stop_tts_worker(self) -> None:
+        """Let queued replies finish, then stop the TTS worker."""
+        self.wait_for_speech()
+        self._tts_queue.put(None)
+        self._tts_thread.join(timeout=5)
+            
     def listen_for_wake_word(self) -> bool:
         """
         Listen for wake word.
@@ -187,10 +310,11 @@ class DigitalWaiterRobot:
             return True  # Skip wake word if not configured
             
         logger.info("Listening for wake word...")
+        self.wait_for_speech()
         
         try:
             while self.running:
-                # Read audio chunk
+                # Read audio chunk (blocking read paces the loop)
                 audio_chunk = self.microphone.read_chunk()
                 if audio_chunk is None:
                     continue
@@ -224,15 +348,22 @@ class DigitalWaiterRobot:
             # Record audio until silence
             audio_config = self.config.get('audio', {})
             
-            logger.debug(f"Recording with settings: "
-                        f"silence_threshold={audio_config.get('silence_threshold', 500)}, "
-                        f"silence_duration={audio_config.get('silence_duration', 1.5)}s, "
-                        f"max_duration={audio_config.get('max_recording_duration', 10)}s")
-            
+            # %-style so the arguments are only formatted when DEBUG is on
+            logger.debug("Recording with settings: silence_threshold=%s, "
+                         "silence_duration=%ss, max_duration=%ss",
+                         audio_config.get('silence_threshold', 500),
+                         audio_config.get('silence_duration', 1.5),
+                         audio_config.get('max_recording_duration', 10))
+            
+            # Decode while recording, so only the final flush remains
+            # once the customer stops speaking
+            self.speech_recognizer.start_utterance(use_grammar=True)
+            self.wait_for_speech()
             audio_data = self.microphone.record_until_silence(
                 silence_threshold=audio_config.get('silence_threshold', 500),
                 silence_duration=audio_config.get('silence_duration', 1.5),
-                max_duration=audio_config.get('max_recording_duration', 10)
+                max_duration=audio_config.get('max_recording_duration', 10),
+                on_chunk=self.speech_recognizer.accept_chunk
             )
             
             if audio_data is None:
@@ -245,10 +376,15 @@ class DigitalWaiterRobot:
             # Save audio for debugging if enabled
             if logger.level <= logging.DEBUG:
                 debug_file = self.speech_recognizer.save_audio_for_debug(audio_data)
-                logger.debug(f"Debug audio saved to: {debug_file}")
+                logger.debug("Debug audio saved to: %s", debug_file)
                 
-            # Recognize speech
-            text = self.speech_recognizer.recognize(audio_data)
+            # Recognize speech (flush the streamed decode)
+            text = self.speech_recognizer.finish_utterance()
+            
+            # Out-of-grammar or empty: decode again without the grammar
+            if text is None and self.speech_recognizer.has_grammar:
+                logger.debug("Grammar decode failed, retrying with full recognizer")
+                text = self.speech_recognizer.recognize(audio_data)
             
             if text:
                 logger.info(f"Successfully recognized: '{text}'")
@@ -260,7 +396,7 @@ class DigitalWaiterRobot:
             
         except Exception as e:
             logger.error(f"Error during speech recognition: {e}")
-            logger.debug(f"Error details: ", exc_info=True)
+            logger.debug("Error details: ", exc_info=True)
             self.speak("Sorry, I encountered an error while listening. Please try again.")
             return None
             
@@ -277,11 +413,9 @@ class DigitalWaiterRobot:
         if not text:
             return False
             
-        # Get all menu item names for matching
-        menu_items = [item['name'] for item in self.menu_manager.get_all_items()]
-        
-        # Process intent
-        result = self.intent_processor.process(text, menu_items)
+        # Process intent (the cached name list is only re-indexed by the
+        # processor if the menu was reloaded)
+        result = self.intent_processor.process(text, self.menu_manager.get_item_names())
         intent = result['intent']
         entities = result['entities']
         
@@ -392,12 +526,8 @@ class DigitalWaiterRobot:
             return False
             
         # Provide order summary
-        summary = f"Your order: "
-        items_list = []
-        for item in order.items:
-            items_list.append(f"{item.quantity} {item.name}")
-        summary += ", ".join(items_list)
-        summary += f". Total: ${order.total_price():.2f}"
+        items_text = ", ".join(f"{item.quantity} {item.name}" for item in order.items)
+        summary = f"Your order: {items_text}. Total: ${order.total_price():.2f}"
         
         self.speak(summary)
         self.speak("Shall I confirm your order?")
@@ -500,26 +630,20 @@ class DigitalWaiterRobot:
                     logger.info(f"Final order saved to: {saved_path}")
                     self.speak("Thank you! Your order has been saved.")
         
-        # Clean up components
-        if self.microphone:
-            self.microphone.close()
-        if self.wake_word_detector:
-            self.wake_word_detector.close()
-        if self.speech_recognizer:
-            self.speech_recognizer.close()
-        if self.speech_synthesizer:
-            self.speech_synthesizer.close()
+        # Clean up constructed components, last built first (the TTS
+        # worker drains before the synthesizer closes, etc.)
+        components, self._components = self._components, []
+        for name, close in reversed(components):
+            try:
+                close()
+            except Exception as e:
+                logger.error(f"Error closing {name}: {e}")
             
         logger.info("Robot stopped")
 
 
 def main():
     """Main entry point."""
-    # Create necessary directories
-    Path("logs").mkdir(exist_ok=True)
-    Path("data/orders").mkdir(parents=True, exist_ok=True)
-    Path("models").mkdir(exist_ok=True)
-    
     # Create and run robot
     robot = DigitalWaiterRobot()
     robot.run()
@@ -4,9 +4,16 @@ Menu manager for loading and searching menu items
 
 import yaml
 import logging
+from itertools import chain, islice
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    # libyaml-backed loader: same safe subset, parsed in C
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +39,11 @@ class MenuManager:
         self.menu_file = menu_file
         self.menu_data: Dict[str, Any] = {}
         self.all_items: List[Dict[str, Any]] = []
+        # Lookup structures rebuilt on every load
+        self._items_by_name: Dict[str, Dict[str, Any]] = {}
+        self._item_names: List[str] = []
+        # search_item results by normalized query (misses cached as None)
+        self._search_cache: Dict[str, Optional[Dict[str, Any]]] = {}
         
         self._load_menu()
         
@@ -44,7 +56,7 @@ class MenuManager:
                 raise FileNotFoundError(f"Menu file not found: {self.menu_file}")
                 
             with open(menu_path, 'r') as f:
-                self.menu_data = yaml.safe_load(f)
+                self.menu_data = yaml.load(f, Loader=YamlLoader)
                 
             # Build flat list of all items with category info
             self.all_items = []
@@ -55,6 +67,13 @@ class MenuManager:
                     item_with_category['category'] = category_name
                     self.all_items.append(item_with_category)
                     
+            # Index by lowercase name (first item wins, as in a linear scan)
+            self._items_by_name = {}
+            for item in self.all_items:
+                self._items_by_name.setdefault(item['name'].lower(), item)
+            self._item_names = [item['name'] for item in self.all_items]
+            self._search_cache = {}
+                    
             logger.info(f"Menu loaded: {len(self.all_items)} items from "
                        f"{len(self.menu_data.get('categories', []))} categories")
             
@@ -71,6 +90,15 @@ class MenuManager:
         """
         return self.all_items.copy()
         
+    def get_item_names(self) -> List[str]:
+        """
+        Get the names of all menu items.
+        
+        Returns:
+            Cached list of item names (shared; do not modify)
+        """
+        return self._item_names
+        
     def get_categories(self) -> List[str]:
         """
         Get all category names.
@@ -108,11 +136,21 @@ class MenuManager:
         if not query_lower:
             return None
             
+        # Customers repeat item names across an order ("latte" to order,
+        # then to ask about it), so remember every answer, misses included
+        if query_lower in self._search_cache:
+            return self._search_cache[query_lower]
+        item = self._search_item_uncached(query, query_lower)
+        self._search_cache[query_lower] = item
+        return item
+        
+    def _search_item_uncached(self, query: str, query_lower: str) -> Optional[Dict[str, Any]]:
+        """Scan the menu for the best match to a normalized query."""
         # First, try exact match
-        for item in self.all_items:
-            if item['name'].lower() == query_lower:
-                logger.info(f"Exact match found: {item['name']}")
-                return item
+        item = self._items_by_name.get(query_lower)
+        if item is not None:
+            logger.info(f"Exact match found: {item['name']}")
+            return item
                 
         # Then, try partial match (contains)
         for item in self.all_items:
@@ -147,21 +185,16 @@ class MenuManager:
         if not query_lower:
             return []
             
-        results = []
-        
         # Exact matches first
-        for item in self.all_items:
-            if item['name'].lower() == query_lower:
-                results.append(item)
-                
-        # Then partial matches
-        for item in self.all_items:
-            if query_lower in item['name'].lower() and item not in results:
-                results.append(item)
-                if len(results) >= max_results:
-                    break
-                    
-        return results[:max_results]
+        exact = [item for item in self.all_items 
+                 if item['name'].lower() == query_lower]
+                 
+        # Then partial matches, generated lazily until max_results is reached
+        partial = (item for item in self.all_items 
+                   if query_lower in item['name'].lower() 
+                   and item['name'].lower() != query_lower)
+                   
+        return list(islice(chain(exact, partial), max_results))
         
     def get_popular_items(self, max_items: int = 3) -> List[Dict[str, Any]]:
         """
@@ -173,8 +206,8 @@ class MenuManager:
         Returns:
             List of popular items
         """
-        popular = [item for item in self.all_items if item.get('popular', False)]
-        return popular[:max_items]
+        popular = (item for item in self.all_items if item.get('popular', False))
+        return list(islice(popular, max_items))
         
     def get_items_by_dietary(self, dietary_filter: str) -> List[Dict[str, Any]]:
         """
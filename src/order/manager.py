@@ -2,6 +2,7 @@
 Order manager for tracking and saving customer orders
 """
 
+import os
 import json
 import yaml
 import logging
@@ -10,6 +11,19 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
+try:
+    # libyaml-backed loader/dumper: same safe subset, handled in C
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+try:
+    # Optional: much faster JSON serializer (pip install orjson)
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -252,15 +266,37 @@ class OrderManager:
             # Convert order to dictionary
             order_dict = self.current_order.to_dict()
             
-            # Save to file
-            with open(filepath, 'w') as f:
-                if self.file_format == 'json':
-                    json.dump(order_dict, f, indent=2)
-                elif self.file_format == 'yaml':
-                    yaml.dump(order_dict, f, default_flow_style=False)
+            if self.file_format not in ('json', 'yaml'):
+                logger.error(f"Unsupported file format: {self.file_format}")
+                return None
+                
+            # Serialize in memory, then write it in one call
+            if self.file_format == 'json':
+                if ORJSON_AVAILABLE:
+                    data = orjson.dumps(order_dict, option=orjson.OPT_INDENT_2)
                 else:
-                    logger.error(f"Unsupported file format: {self.file_format}")
-                    return None
+                    data = json.dumps(order_dict, indent=2).encode('utf-8')
+            else:
+                data = yaml.dump(order_dict, Dumper=YamlDumper,
+                                 default_flow_style=False).encode('utf-8')
+                
+            # Write to a temp file, flush it to disk and rename it into place,
+            # so a crash or power loss mid-write never leaves a truncated
+            # order file
+            tmp_path = filepath.with_name(filepath.name + '.tmp')
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                # Don't leave partial *.tmp files behind in the orders folder
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
                     
             logger.info(f"Order saved to: {filepath}")
             return str(filepath)
@@ -284,7 +320,7 @@ class OrderManager:
                 if filepath.endswith('.json'):
                     data = json.load(f)
                 elif filepath.endswith('.yaml') or filepath.endswith('.yml'):
-                    data = yaml.safe_load(f)
+                    data = yaml.load(f, Loader=YamlLoader)
                 else:
                     logger.error("Unsupported file format")
                     return None
@@ -3,8 +3,26 @@ Speech module for ASR (Automatic Speech Recognition) and TTS (Text-to-Speech).
 All components are offline and license-free for commercial use.
 """
 
-from .recognizer import SpeechRecognizer
-from .synthesizer import SpeechSynthesizer
+from importlib import import_module
 
 __all__ = ["SpeechRecognizer", "SpeechSynthesizer"]
 
+# Submodule providing each public name. Imported on first access (PEP 562),
+# so importing one submodule does not load its siblings' dependencies.
+_LAZY_IMPORTS = {
+    "SpeechRecognizer": ".recognizer",
+    "SpeechSynthesizer": ".synthesizer",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
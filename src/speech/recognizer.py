@@ -5,7 +5,7 @@ Apache 2.0 licensed, suitable for commercial use
 
 import json
 import logging
-from typing import Optional
+from typing import List, Optional
 import wave
 import tempfile
 import os
@@ -32,6 +32,10 @@ class SpeechRecognizer:
     - Offline operation
     - Multiple language support
     - Low resource usage
+    - Streaming decode (start_utterance/accept_chunk/finish_utterance), so
+      audio can be recognized while it is still being recorded
+    - Optional grammar-constrained decoding (set_grammar) for fast,
+      menu-only recognition
     - Apache 2.0 license (commercial-use friendly)
     """
     
@@ -53,6 +57,11 @@ class SpeechRecognizer:
         self.sample_rate = sample_rate
         self.model: Optional[Model] = None
         self.recognizer: Optional[KaldiRecognizer] = None
+        # Recognizer restricted to a phrase list (see set_grammar)
+        self.grammar_recognizer: Optional[KaldiRecognizer] = None
+        self._use_grammar = False
+        # Finalized segments of the utterance currently being streamed
+        self._segments: List[str] = []
         
         self._initialize_model()
         
@@ -77,52 +86,108 @@ class SpeechRecognizer:
             logger.error(f"Failed to initialize speech recognizer: {e}")
             raise
             
-    def recognize(self, audio_data: bytes) -> Optional[str]:
+    def set_grammar(self, phrases: Optional[List[str]]) -> None:
         """
-        Recognize speech from audio data.
+        Restrict decoding to a fixed vocabulary (e.g. menu items and commands).
+        
+        With a small grammar Vosk only searches those words, which is much
+        faster on slow CPUs. Words missing from the model are ignored by Vosk.
         
         Args:
-            audio_data: Raw audio bytes (int16, mono, 16kHz)
-            
-        Returns:
-            Recognized text, or None if recognition failed
+            phrases: Phrases to recognize, or None to disable the grammar
         """
-        if self.recognizer is None:
+        if self.model is None:
             logger.error("Recognizer not initialized")
-            return None
+            return
             
-        if not audio_data:
-            logger.debug("Empty audio data provided")
-            return None
+        if not phrases:
+            self.grammar_recognizer = None
+            logger.info("Speech grammar disabled")
+            return
             
+        # Deduplicated, lowercase; [unk] absorbs out-of-grammar speech
+        vocabulary = sorted({phrase.lower() for phrase in phrases})
+        grammar = json.dumps(vocabulary + ["[unk]"])
         try:
-            # Process audio data in chunks for better performance
-            chunk_size = 4000  # Process in 4KB chunks
-            results = []
+            self.grammar_recognizer = KaldiRecognizer(self.model, self.sample_rate, grammar)
+            self.grammar_recognizer.SetWords(True)
+            logger.info(f"Speech grammar enabled ({len(vocabulary)} phrases)")
+        except Exception as e:
+            self.grammar_recognizer = None
+            logger.warning(f"Could not build grammar recognizer: {e}")
             
-            # Reset recognizer for clean slate
-            self.reset()
+    @property
+    def has_grammar(self) -> bool:
+        """Whether a grammar-constrained recognizer is available."""
+        return self.grammar_recognizer is not None
+        
+    def _current_recognizer(self) -> Optional["KaldiRecognizer"]:
+        """Recognizer used for the utterance being decoded."""
+        if self._use_grammar and self.grammar_recognizer is not None:
+            return self.grammar_recognizer
+        return self.recognizer
+        
+    def start_utterance(self, use_grammar: bool = False) -> None:
+        """
+        Start decoding a new utterance, discarding any previous state.
+        
+        Args:
+            use_grammar: Decode with the grammar recognizer, if one is set
+        """
+        self._use_grammar = use_grammar and self.grammar_recognizer is not None
+        self.reset()
+        self._segments = []
+        
+    def accept_chunk(self, chunk: bytes) -> None:
+        """
+        Feed the next piece of the current utterance to the decoder.
+        
+        Args:
+            chunk: Raw audio bytes (int16, mono, 16kHz)
+        """
+        recognizer = self._current_recognizer()
+        if recognizer is None or not chunk:
+            return
             
-            for i in range(0, len(audio_data), chunk_size):
-                chunk = audio_data[i:i+chunk_size]
-                
-                if self.recognizer.AcceptWaveform(chunk):
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get('text', '').strip()
-                    if text:
-                        results.append(text)
-                        logger.debug(f"Partial result: '{text}'")
+        try:
+            if recognizer.AcceptWaveform(chunk):
+                result = json.loads(recognizer.Result())
+                text = result.get('text', '').strip()
+                if text:
+                    self._segments.append(text)
+                    logger.debug("Partial result: '%s'", text)
+        except Exception as e:
+            logger.error(f"Error decoding audio chunk: {e}")
             
+    def finish_utterance(self) -> Optional[str]:
+        """
+        Flush the decoder and return the text of the current utterance.
+        
+        Returns:
+            Recognized text, or None if nothing was recognized. With the
+            grammar, None is also returned for out-of-grammar speech so the
+            caller can fall back to recognize()
+        """
+        recognizer = self._current_recognizer()
+        if recognizer is None:
+            logger.error("Recognizer not initialized")
+            return None
+            
+        try:
             # Get final result
-            final_result = json.loads(self.recognizer.FinalResult())
+            final_result = json.loads(recognizer.FinalResult())
             final_text = final_result.get('text', '').strip()
             if final_text:
-                results.append(final_text)
-                logger.debug(f"Final result: '{final_text}'")
+                self._segments.append(final_text)
+                logger.debug("Final result: '%s'", final_text)
+            
+            if self._use_grammar and any('[unk]' in segment for segment in self._segments):
+                logger.debug("Out-of-grammar speech: %s", self._segments)
+                return None
             
             # Combine all results
-            if results:
-                combined_text = ' '.join(results).strip()
+            if self._segments:
+                combined_text = ' '.join(self._segments).strip()
                 logger.info(f"Speech recognized: '{combined_text}'")
                 return combined_text
             else:
@@ -134,8 +199,38 @@ class SpeechRecognizer:
             return None
         except Exception as e:
             logger.error(f"Error during speech recognition: {e}")
-            logger.debug(f"Audio data length: {len(audio_data)} bytes")
             return None
+        finally:
+            self._segments = []
+            
+    def recognize(self, audio_data: bytes) -> Optional[str]:
+        """
+        Recognize speech from audio data.
+        
+        Args:
+            audio_data: Raw audio bytes (int16, mono, 16kHz)
+            
+        Returns:
+            Recognized text, or None if recognition failed
+        """
+        if self.recognizer is None:
+            logger.error("Recognizer not initialized")
+            return None
+            
+        if not audio_data:
+            logger.debug("Empty audio data provided")
+            return None
+            
+        # Process audio data in chunks for better performance
+        chunk_size = 4000  # Process in 4KB chunks
+        
+        # Reset recognizer for clean slate
+        self.start_utterance()
+        
+        for i in range(0, len(audio_data), chunk_size):
+            self.accept_chunk(audio_data[i:i+chunk_size])
+            
+        return self.finish_utterance()
             
     def recognize_from_file(self, wav_file: str) -> Optional[str]:
         """
@@ -233,13 +328,16 @@ class SpeechRecognizer:
     
     def reset(self) -> None:
         """Reset the recognizer state."""
-        if self.model is not None:
-            self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)
+        # Reset() clears the decoder in place; building a new recognizer
+        # (and, for the grammar, recompiling its graph) per utterance is slow
+        recognizer = self._current_recognizer()
+        if recognizer is not None:
+            recognizer.Reset()
             logger.debug("Speech recognizer reset")
             
     def close(self) -> None:
         """Clean up resources."""
+        self.grammar_recognizer = None
         self.recognizer = None
         self.model = None
         logger.info("Speech recognizer closed")
@@ -33,7 +33,7 @@ class SpeechSynthesizer:
     """
     
     def __init__(self, rate: int = 150, volume: float = 0.9, 
-                 voice_id: Optional[str] = None):
+                 voice_id: Optional[str] = None, lazy_init: bool = False):
         """
         Initialize the speech synthesizer.
         
@@ -41,6 +41,10 @@ class SpeechSynthesizer:
             rate: Speaking rate in words per minute (default: 150)
             volume: Volume level from 0.0 to 1.0 (default: 0.9)
             voice_id: Specific voice ID to use (None for default)
+            lazy_init: Create the pyttsx3 engine on first use instead of now.
+                       Several pyttsx3 drivers (espeak loop, nsss, sapi5 COM)
+                       must be used from the thread that created them, so a
+                       synthesizer driven from a worker thread should be lazy
         """
         if not PYTTSX3_AVAILABLE:
             raise ImportError(
@@ -53,7 +57,8 @@ class SpeechSynthesizer:
         self.voice_id = voice_id
         self.engine: Optional[pyttsx3.Engine] = None
         
-        self._initialize_engine()
+        if not lazy_init:
+            self._initialize_engine()
         
     def _initialize_engine(self) -> None:
         """Initialize the TTS engine."""
@@ -81,6 +86,15 @@ class SpeechSynthesizer:
             logger.error(f"Failed to initialize TTS engine: {e}")
             raise
             
+    def _ensure_engine(self) -> bool:
+        """Create the engine on first use (lazy_init); True if it is ready."""
+        if self.engine is None:
+            try:
+                self._initialize_engine()
+            except Exception:
+                return False
+        return True
+            
     def speak(self, text: str, blocking: bool = True) -> bool:
         """
         Speak the given text.
@@ -92,7 +106,7 @@ class SpeechSynthesizer:
         Returns:
             True if successful, False otherwise
         """
-        if self.engine is None:
+        if not self._ensure_engine():
             logger.error("TTS engine not initialized")
             return False
             
@@ -125,7 +139,7 @@ class SpeechSynthesizer:
         Returns:
             True if successful, False otherwise
         """
-        if self.engine is None:
+        if not self._ensure_engine():
             logger.error("TTS engine not initialized")
             return False
             
@@ -140,22 +154,22 @@ class SpeechSynthesizer:
             return False
             
     def set_rate(self, rate: int) -> None:
-        """Set speaking rate in words per minute."""
+        """Set speaking rate in words per minute (applied on creation if lazy)."""
+        self.rate = rate
         if self.engine:
-            self.rate = rate
             self.engine.setProperty('rate', rate)
-            logger.debug(f"Speaking rate set to: {rate}")
+        logger.debug(f"Speaking rate set to: {rate}")
             
     def set_volume(self, volume: float) -> None:
-        """Set volume level (0.0 to 1.0)."""
+        """Set volume level (0.0 to 1.0; applied on creation if lazy)."""
+        self.volume = max(0.0, min(1.0, volume))
         if self.engine:
-            self.volume = max(0.0, min(1.0, volume))
             self.engine.setProperty('volume', self.volume)
-            logger.debug(f"Volume set to: {self.volume}")
+        logger.debug(f"Volume set to: {self.volume}")
             
     def list_voices(self) -> None:
         """List all available voices."""
-        if self.engine is None:
+        if not self._ensure_engine():
             logger.error("TTS engine not initialized")
             return
             
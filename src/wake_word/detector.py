@@ -5,8 +5,9 @@ Offline, open-source (Apache 2.0), and optimized for Raspberry Pi
 
 import logging
 import numpy as np
-from typing import Optional
+from typing import Dict, List, Optional
 try:
+    import openwakeword
     from openwakeword.model import Model
     OPENWAKEWORD_AVAILABLE = True
 except ImportError:
@@ -30,13 +31,25 @@ class WakeWordDetector:
     - Apache 2.0 license (commercial-use friendly)
     """
     
-    def __init__(self, model_name: str = "hey_jarvis", threshold: float = 0.5):
+    def __init__(self, model_name: str = "hey_jarvis", threshold: float = 0.5,
+                 silence_threshold: float = 0.0, model_path: Optional[str] = None,
+                 inference_framework: str = "tflite", silence_hangover: int = 2):
         """
         Initialize the wake word detector.
         
         Args:
             model_name: Wake word model to use (e.g., "hey_jarvis", "alexa", "hey_mycroft")
             threshold: Detection threshold (0.0-1.0, higher = more strict)
+            silence_threshold: Mean amplitude below which a chunk is treated as
+                              silence and the model is skipped (0 disables the gate).
+                              Gated chunks never reach the model, so its streaming
+                              buffers are reset when the gate engages and the next
+                              sound is scored on fresh context
+            model_path: Optional custom model file (e.g. an INT8-quantized
+                        .onnx/.tflite export) to load instead of the built-ins
+            inference_framework: "tflite" or "onnx"; must match model_path
+            silence_hangover: Quiet chunks still scored after sound stops, so the
+                              tail of a wake word is never gated away
         """
         if not OPENWAKEWORD_AVAILABLE:
             raise ImportError(
@@ -46,16 +59,64 @@ class WakeWordDetector:
             
         self.model_name = model_name
         self.threshold = threshold
+        self.silence_threshold = silence_threshold
+        self.silence_hangover = silence_hangover
+        self._silent_run = 0  # Consecutive chunks below silence_threshold
+        self.model_path = model_path
+        self.inference_framework = inference_framework
         self.model: Optional[Model] = None
+        # Reusable |x| scratch for the silence gate (uint16 holds |-32768|)
+        self._abs_buf = np.empty(0, dtype=np.uint16)
+        # Scores from the most recent predict() call, for debugging/tuning
+        self.last_scores: Dict[str, float] = {}
         
         self._initialize_model()
         
+    @classmethod
+    def available_models(cls) -> List[str]:
+        """List the bundled pre-trained wake word models without loading any."""
+        if not OPENWAKEWORD_AVAILABLE:
+            return []
+        return list(openwakeword.MODELS.keys())
+        
+    @staticmethod
+    def _match_model_name(model_name: str, candidates: List[str]) -> Optional[str]:
+        """Find the candidate matching a model name or a common variation of it."""
+        model_variations = [
+            model_name,
+            model_name.lower(),
+            model_name.replace('_', ' '),
+            model_name.replace(' ', '_'),
+        ]
+        
+        for variation in model_variations:
+            for candidate in candidates:
+                if variation.lower() in candidate.lower():
+                    return candidate
+        return None
+        
     def _initialize_model(self) -> None:
         """Initialize the OpenWakeWord model."""
         try:
-            # Initialize the model (loads all available models by default)
-            logger.info("Loading OpenWakeWord models...")
-            self.model = Model()
+            if self.model_path:
+                # Custom (e.g. quantized) model file replaces the built-ins
+                logger.info(f"Loading OpenWakeWord model from: {self.model_path}")
+                self.model = Model(
+                    wakeword_models=[self.model_path],
+                    inference_framework=self.inference_framework
+                )
+            else:
+                # Resolve the name up front so only the requested model is
+                # loaded (an empty list loads all bundled models)
+                requested = None
+                if self.model_name:
+                    requested = self._match_model_name(self.model_name, self.available_models())
+                wakeword_models = [requested] if requested else []
+                logger.info(f"Loading OpenWakeWord models: {wakeword_models or 'all'}")
+                self.model = Model(
+                    wakeword_models=wakeword_models,
+                    inference_framework=self.inference_framework
+                )
             
             available_models = list(self.model.models.keys())
             logger.info(f"Available wake word models: {available_models}")
@@ -65,21 +126,7 @@ class WakeWordDetector:
                 logger.warning(f"Requested model '{self.model_name}' not found.")
                 
                 # Try common model name variations
-                model_variations = [
-                    self.model_name,
-                    self.model_name.lower(),
-                    self.model_name.replace('_', ' '),
-                    self.model_name.replace(' ', '_'),
-                ]
-                
-                found_model = None
-                for variation in model_variations:
-                    for available_model in available_models:
-                        if variation.lower() in available_model.lower():
-                            found_model = available_model
-                            break
-                    if found_model:
-                        break
+                found_model = self._match_model_name(self.model_name, available_models)
                 
                 if found_model:
                     self.model_name = found_model
@@ -109,33 +156,67 @@ class WakeWordDetector:
         Returns:
             True if wake word detected, False otherwise
         """
-        if self.model is None:
-            logger.error("Model not initialized")
-            return False
-            
         if not audio_chunk or len(audio_chunk) == 0:
             logger.debug("Empty audio chunk provided")
             return False
             
         try:
-            # Convert bytes to numpy array (int16)
+            # Zero-copy int16 view of the raw bytes
             audio_data = np.frombuffer(audio_chunk, dtype=np.int16)
+        except ValueError as e:
+            logger.error(f"Audio data conversion error: {e}")
+            logger.debug(f"Audio chunk length: {len(audio_chunk)} bytes")
+            return False
             
-            # Check if we have enough data
-            if len(audio_data) == 0:
-                logger.debug("No audio data after conversion")
-                return False
+        return self.detect_array(audio_data)
+        
+    def detect_array(self, audio_data: np.ndarray) -> bool:
+        """
+        Detect wake word in already-decoded audio samples.
+        
+        Lets callers that have already wrapped the chunk in an array (e.g. to
+        compute a level meter) skip a second conversion.
+        
+        Args:
+            audio_data: int16 PCM samples (mono, 16kHz)
             
-            # OpenWakeWord expects float32 normalized to [-1, 1]
-            audio_float = audio_data.astype(np.float32) / 32768.0
+        Returns:
+            True if wake word detected, False otherwise
+        """
+        if self.model is None:
+            logger.error("Model not initialized")
+            return False
             
-            # Ensure we have the right shape
-            if audio_float.ndim != 1:
-                logger.error(f"Expected 1D audio, got shape: {audio_float.shape}")
-                return False
+        # Check if we have enough data
+        if len(audio_data) == 0:
+            logger.debug("No audio data provided")
+            return False
             
-            # Get predictions from model
-            predictions = self.model.predict(audio_float)
+        try:
+            # Cheap energy gate: silence cannot contain the wake word, so skip
+            # the melspectrogram/embedding/classifier forward pass entirely
+            # (model state is reset as the gate engages, see below)
+            if self.silence_threshold > 0:
+                if self._abs_buf.shape[0] != audio_data.shape[0]:
+                    self._abs_buf = np.empty(audio_data.shape[0], dtype=np.uint16)
+                np.abs(audio_data, out=self._abs_buf, casting='unsafe')
+                if self._abs_buf.mean() < self.silence_threshold:
+                    self._silent_run += 1
+                    if self._silent_run > self.silence_hangover:
+                        if self._silent_run == self.silence_hangover + 1:
+                            # Gate engaging: the model's streaming feature
+                            # buffers would otherwise splice pre-silence audio
+                            # onto whatever comes next, so start it afresh
+                            self.model.reset()
+                        return False
+                else:
+                    self._silent_run = 0
+            
+            # OpenWakeWord expects 16-bit PCM samples as-is; it casts its
+            # buffered input back to int16, so normalized floats would
+            # truncate to zero.
+            predictions = self.model.predict(audio_data)
+            self.last_scores = predictions
             
             if not predictions:
                 logger.debug("No predictions returned from model")
@@ -145,13 +226,14 @@ class WakeWordDetector:
             max_score = 0.0
             best_model = None
             
-            # If we have a specific model name, prioritize it
-            if self.model_name and self.model_name in predictions:
-                score = predictions[self.model_name]
+            # If we have a specific model name, prioritize it (model_name was
+            # resolved to a loaded model key at init, so one lookup suffices)
+            score = predictions.get(self.model_name) if self.model_name else None
+            if score is not None:
                 if score >= self.threshold:
                     logger.info(f"Wake word detected: {self.model_name} (score: {score:.3f})")
                     return True
-                max_score = max(max_score, score)
+                max_score = score
                 best_model = self.model_name
             else:
                 # Check all available models
@@ -166,22 +248,26 @@ class WakeWordDetector:
             
             # Log the best score for debugging
             if max_score > 0.1:  # Only log if there's some detection
-                logger.debug(f"Best detection: {best_model} (score: {max_score:.3f}, threshold: {self.threshold})")
+                logger.debug("Best detection: %s (score: %.3f, threshold: %s)",
+                             best_model, max_score, self.threshold)
                     
             return False
             
-        except ValueError as e:
-            logger.error(f"Audio data conversion error: {e}")
-            logger.debug(f"Audio chunk length: {len(audio_chunk)} bytes")
-            return False
         except Exception as e:
             logger.error(f"Error during wake word detection: {e}")
             return False
             
+    def set_threshold(self, threshold: float) -> None:
+        """Set detection threshold (0.0 to 1.0) without reloading the model."""
+        self.threshold = max(0.0, min(1.0, threshold))
+        logger.debug(f"Detection threshold set to: {self.threshold}")
+            
     def reset(self) -> None:
         """Reset the model state."""
         if self.model is not None:
             self.model.reset()
+            self.last_scores = {}
+            self._silent_run = 0
             logger.debug("Wake word detector reset")
             
     def close(self) -> None:
@@ -4,6 +4,7 @@ ReSpeaker Mic Array v2.0 - Test and Diagnostic Tool
 Tests USB connection, audio capture, and provides device information
 """
 
+import re
 import sys
 import subprocess
 import logging
@@ -14,6 +15,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# lsusb output identifying the ReSpeaker's XMOS XVF-3000 chipset
+XMOS_USB_RE = re.compile(r'xmos|xvf3000', re.IGNORECASE)
+# arecord/aplay -l lines naming the ReSpeaker (or a generic USB audio card)
+ALSA_RESPEAKER_RE = re.compile(r'respeaker|xmos|usb audio|usb pnp', re.IGNORECASE)
+ALSA_CARD_RE = re.compile(r'card', re.IGNORECASE)
+# PyAudio device names identifying the ReSpeaker
+PYAUDIO_RESPEAKER_RE = re.compile(r'respeaker|xmos|usb pnp', re.IGNORECASE)
+
+# Width of the live audio level meter, in characters
+METER_WIDTH = 50
+# Samples per capture read: 256 ms at 16 kHz, one PortAudio call (and one
+# meter redraw) per read, ~4 per second
+CAPTURE_CHUNK = 4096
+# Block character on UTF-8 terminals, plain ASCII on serial/headless consoles
+BAR_CHAR = '█' if (sys.stdout.encoding or '').lower().startswith('utf') else '#'
+# Pre-rendered, padded meter bars indexed by bar length
+METER_BARS = [(BAR_CHAR * n).ljust(METER_WIDTH) for n in range(METER_WIDTH + 1)]
+# Meter line template (bar, amplitude); '\r' keeps redraws on one line
+METER_LINE = "   %s %5.0f\r"
+
 
 def check_usb_connection():
     """Check if ReSpeaker is connected via USB."""
@@ -22,21 +43,22 @@ def check_usb_connection():
     print("="*60)
     
     try:
-        result = subprocess.run(['lsusb'], capture_output=True, text=True)
+        result = subprocess.run(['lsusb'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
         output = result.stdout
         
         # Check for ReSpeaker specific VID:PID
         if '2886:0018' in output:
             print("✅ ReSpeaker Mic Array v2.0 detected!")
-            for line in output.split('\n'):
+            for line in output.splitlines():
                 if '2886:0018' in line:
                     print(f"   {line}")
             return True
         # Check for XMOS chipset
-        elif 'xmos' in output.lower() or 'XVF3000' in output:
+        elif XMOS_USB_RE.search(output):
             print("✅ XMOS device detected (likely ReSpeaker)")
-            for line in output.split('\n'):
-                if 'xmos' in line.lower() or 'XVF3000' in line:
+            for line in output.splitlines():
+                if XMOS_USB_RE.search(line):
                     print(f"   {line}")
             return True
         else:
@@ -59,17 +81,17 @@ def check_audio_devices():
     try:
         # Check capture devices
         print("\n📥 Audio Input Devices:")
-        result = subprocess.run(['arecord', '-l'], capture_output=True, text=True)
+        result = subprocess.run(['arecord', '-l'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
         output = result.stdout
         
         found = False
-        respeaker_keywords = ['respeaker', 'xmos', 'usb audio', 'usb pnp']
         
-        for line in output.split('\n'):
-            if any(keyword in line.lower() for keyword in respeaker_keywords):
+        for line in output.splitlines():
+            if ALSA_RESPEAKER_RE.search(line):
                 print(f"   ✅ {line}")
                 found = True
-            elif 'card' in line.lower():
+            elif ALSA_CARD_RE.search(line):
                 print(f"   {line}")
         
         if not found:
@@ -77,13 +99,14 @@ def check_audio_devices():
             
         # Check playback devices
         print("\n📤 Audio Output Devices:")
-        result = subprocess.run(['aplay', '-l'], capture_output=True, text=True)
+        result = subprocess.run(['aplay', '-l'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
         output = result.stdout
         
-        for line in output.split('\n'):
-            if any(keyword in line.lower() for keyword in respeaker_keywords):
+        for line in output.splitlines():
+            if ALSA_RESPEAKER_RE.search(line):
                 print(f"   ✅ {line}")
-            elif 'card' in line.lower():
+            elif ALSA_CARD_RE.search(line):
                 print(f"   {line}")
                 
         return found
@@ -93,8 +116,12 @@ def check_audio_devices():
         return False
 
 
-def test_pyaudio_detection():
-    """Test if PyAudio can detect ReSpeaker."""
+def test_pyaudio_detection(audio=None):
+    """Test if PyAudio can detect ReSpeaker.
+    
+    Args:
+        audio: Shared PyAudio instance (created and terminated here if None)
+    """
     print("\n" + "="*60)
     print("3. Testing PyAudio Detection")
     print("="*60)
@@ -102,7 +129,9 @@ def test_pyaudio_detection():
     try:
         import pyaudio
         
-        audio = pyaudio.PyAudio()
+        owns_audio = audio is None
+        if owns_audio:
+            audio = pyaudio.PyAudio()
         
         print("\n🎤 Input Devices:")
         respeaker_index = None
@@ -117,8 +146,7 @@ def test_pyaudio_detection():
                 rate = int(info.get('defaultSampleRate', 0))
                 
                 # Check if this is ReSpeaker
-                is_respeaker = any(keyword in name.lower() 
-                                  for keyword in ['respeaker', 'xmos', 'usb pnp'])
+                is_respeaker = PYAUDIO_RESPEAKER_RE.search(name) is not None
                 
                 if is_respeaker:
                     print(f"   ✅ [{i}] {name}")
@@ -128,7 +156,8 @@ def test_pyaudio_detection():
                     print(f"   [ {i}] {name}")
                     print(f"       Channels: {channels}, Sample Rate: {rate} Hz")
         
-        audio.terminate()
+        if owns_audio:
+            audio.terminate()
         
         if respeaker_index is not None:
             print(f"\n✅ ReSpeaker detected at index {respeaker_index}")
@@ -146,8 +175,13 @@ def test_pyaudio_detection():
         return False, None
 
 
-def test_audio_capture(device_index=None):
-    """Test actual audio capture from ReSpeaker."""
+def test_audio_capture(device_index=None, audio=None):
+    """Test actual audio capture from ReSpeaker.
+    
+    Args:
+        device_index: PyAudio input device index (None for default)
+        audio: Shared PyAudio instance (created and terminated here if None)
+    """
     print("\n" + "="*60)
     print("4. Testing Audio Capture")
     print("="*60)
@@ -156,7 +190,9 @@ def test_audio_capture(device_index=None):
         import pyaudio
         import numpy as np
         
-        audio = pyaudio.PyAudio()
+        owns_audio = audio is None
+        if owns_audio:
+            audio = pyaudio.PyAudio()
         
         # Open stream
         print("\n🎙️  Opening audio stream...")
@@ -166,33 +202,39 @@ def test_audio_capture(device_index=None):
             rate=16000,  # Max rate for ReSpeaker
             input=True,
             input_device_index=device_index,
-            frames_per_buffer=1024
+            frames_per_buffer=CAPTURE_CHUNK
         )
         
         print("✅ Stream opened successfully")
         print("\n📊 Capturing 2 seconds of audio for analysis...")
         print("   (Make some noise to test!)")
         
-        # Capture audio
-        frames = []
-        for i in range(int(16000 / 1024 * 2)):  # 2 seconds
-            data = stream.read(1024, exception_on_overflow=False)
-            frames.append(data)
+        # Capture audio, keeping only per-chunk level/peak (reduced at the end)
+        num_chunks = -(-16000 * 2 // CAPTURE_CHUNK)  # 2 seconds, rounded up
+        levels = np.empty(num_chunks, dtype=np.float64)
+        peaks = np.empty(num_chunks, dtype=np.uint16)
+        abs_buf = np.empty(CAPTURE_CHUNK, dtype=np.uint16)
+        for i in range(num_chunks):
+            data = stream.read(CAPTURE_CHUNK, exception_on_overflow=False)
             
-            # Calculate amplitude
+            # Calculate amplitude (uint16 so |-32768| does not wrap)
             audio_data = np.frombuffer(data, dtype=np.int16)
-            amplitude = np.abs(audio_data).mean()
+            np.abs(audio_data, out=abs_buf, casting='unsafe')
+            amplitude = levels[i] = abs_buf.mean()
+            peaks[i] = abs_buf.max()
             
-            # Show visual indicator
-            bars = int(amplitude / 100)
-            print(f"   {'█' * bars} {amplitude:.0f}", end='\r')
+            # Show visual indicator (clamped and padded so each redraw
+            # fully overwrites the previous one). A '\r' line never triggers
+            # a line-buffered flush, so flush explicitly.
+            bars = min(int(amplitude / 100), METER_WIDTH)
+            sys.stdout.write(METER_LINE % (METER_BARS[bars], amplitude))
+            sys.stdout.flush()
         
         print("\n\n✅ Audio capture successful!")
         
-        # Analyze captured audio
-        all_data = np.frombuffer(b''.join(frames), dtype=np.int16)
-        avg_amplitude = np.abs(all_data).mean()
-        max_amplitude = np.abs(all_data).max()
+        # Analyze captured audio (equal-sized chunks, so mean of means)
+        avg_amplitude = levels.mean()
+        max_amplitude = peaks.max()
         
         print("\n📈 Audio Statistics:")
         print(f"   Average amplitude: {avg_amplitude:.2f}")
@@ -210,7 +252,8 @@ def test_audio_capture(device_index=None):
         # Clean up
         stream.stop_stream()
         stream.close()
-        audio.terminate()
+        if owns_audio:
+            audio.terminate()
         
         return True
         
@@ -304,17 +347,31 @@ def main():
     print("ReSpeaker Mic Array v2.0 - Diagnostic Tool")
     print("="*60)
     
+    # Initialize PortAudio once and share it between the PyAudio tests
+    try:
+        import pyaudio
+        audio = pyaudio.PyAudio()
+    except Exception:
+        audio = None  # Each test reports the problem itself
+    
     # Run tests
     usb_ok = check_usb_connection()
     audio_ok = check_audio_devices()
-    pyaudio_ok, device_index = test_pyaudio_detection()
+    pyaudio_ok, device_index = test_pyaudio_detection(audio)
+    
+    if usb_ok and audio_ok and pyaudio_ok:
+        capture_ok = test_audio_capture(device_index, audio)
+    else:
+        capture_ok = False
+    
+    if audio is not None:
+        # Release the device before the robot code opens its own instance
+        audio.terminate()
     
     if usb_ok and audio_ok and pyaudio_ok:
-        capture_ok = test_audio_capture(device_index)
         robot_ok = test_with_robot_code()
     else:
         print("\n⚠️  Skipping audio tests due to detection failures")
-        capture_ok = False
         robot_ok = False
     
     # Summary
@@ -4,9 +4,11 @@ Test script to verify Digital Waiter Robot setup
 Run this after setup.sh to check that all components are working
 """
 
+import os
 import sys
+import argparse
 import logging
-from pathlib import Path
+import importlib.util
 
 # Configure logging
 logging.basicConfig(
@@ -15,6 +17,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Files and directories the robot expects, relative to the project root
+CONFIG_FILES = ('config/settings.yaml', 'config/menu.yaml')
+REQUIRED_DIRS = ('logs', 'data/orders', 'models', 'src')
+# Runtime directories that --fix may create; the others are part of the
+# install, so a missing one must stay a failure
+FIXABLE_DIRS = ('logs', 'data/orders')
+VOSK_MODEL_DIR = 'models/vosk-model-small-en-us-0.15'
+
 # Test results
 results = {
     'passed': [],
@@ -27,21 +37,29 @@ def test_imports():
     """Test that all required packages can be imported."""
     logger.info("Testing Python package imports...")
     
+    # (module, display name, import it). OpenWakeWord and Vosk pull in
+    # their inference runtimes on import, so only check they are installed.
     packages = [
-        ('pyaudio', 'PyAudio'),
-        ('openwakeword', 'OpenWakeWord'),
-        ('vosk', 'Vosk'),
-        ('pyttsx3', 'pyttsx3'),
-        ('yaml', 'PyYAML'),
-        ('numpy', 'NumPy')
+        ('pyaudio', 'PyAudio', True),
+        ('openwakeword', 'OpenWakeWord', False),
+        ('vosk', 'Vosk', False),
+        ('pyttsx3', 'pyttsx3', True),
+        ('yaml', 'PyYAML', True),
+        ('numpy', 'NumPy', True)
     ]
     
-    for module, name in packages:
+    for module, name, do_import in packages:
+        if importlib.util.find_spec(module) is None:
+            logger.error(f"  ✗ {name}: not installed")
+            results['failed'].append(f"Import {name}")
+            continue
         try:
-            __import__(module)
+            if do_import:
+                __import__(module)
             logger.info(f"  ✓ {name}")
             results['passed'].append(f"Import {name}")
-        except ImportError as e:
+        except Exception as e:
+            # Installed but broken (e.g. missing native library)
             logger.error(f"  ✗ {name}: {e}")
             results['failed'].append(f"Import {name}")
 
@@ -95,8 +113,7 @@ def test_models():
     logger.info("Testing AI models...")
     
     # Check Vosk model
-    vosk_model = Path("models/vosk-model-small-en-us-0.15")
-    if vosk_model.exists() and vosk_model.is_dir():
+    if os.path.isdir(VOSK_MODEL_DIR):
         logger.info("  ✓ Vosk model found")
         results['passed'].append("Vosk model")
     else:
@@ -112,14 +129,8 @@ def test_config_files():
     """Test that configuration files exist."""
     logger.info("Testing configuration files...")
     
-    configs = [
-        'config/settings.yaml',
-        'config/menu.yaml'
-    ]
-    
-    for config_file in configs:
-        path = Path(config_file)
-        if path.exists():
+    for config_file in CONFIG_FILES:
+        if os.path.exists(config_file):
             logger.info(f"  ✓ {config_file}")
             results['passed'].append(f"Config: {config_file}")
         else:
@@ -127,20 +138,23 @@ def test_config_files():
             results['failed'].append(f"Config: {config_file}")
 
 
-def test_directories():
-    """Test that required directories exist."""
-    logger.info("Testing directory structure...")
+def test_directories(fix: bool = False):
+    """Test that required directories exist.
     
-    dirs = [
-        'logs',
-        'data/orders',
-        'models',
-        'src'
-    ]
+    Args:
+        fix: Create missing runtime directories (FIXABLE_DIRS) instead of
+             only reporting them
+    """
+    logger.info("Testing directory structure...")
     
-    for directory in dirs:
-        path = Path(directory)
-        if path.exists() and path.is_dir():
+    for directory in REQUIRED_DIRS:
+        if fix and directory in FIXABLE_DIRS and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory, exist_ok=True)
+                logger.info(f"  Created {directory}/")
+            except OSError as e:
+                logger.error(f"  Could not create {directory}/: {e}")
+        if os.path.isdir(directory):
             logger.info(f"  ✓ {directory}/")
             results['passed'].append(f"Directory: {directory}")
         else:
@@ -207,43 +221,51 @@ def test_microphone():
 
 def print_summary():
     """Print test summary."""
-    print("\n" + "=" * 50)
-    print("TEST SUMMARY")
-    print("=" * 50)
+    passed, warnings, failed = results['passed'], results['warnings'], results['failed']
+    
+    # Build the whole report and write it once
+    lines = ["", "=" * 50, "TEST SUMMARY", "=" * 50]
     
-    print(f"\n✓ Passed: {len(results['passed'])}")
-    for item in results['passed']:
-        print(f"  • {item}")
+    lines.append(f"\n✓ Passed: {len(passed)}")
+    lines.extend(f"  • {item}" for item in passed)
     
-    if results['warnings']:
-        print(f"\n⚠ Warnings: {len(results['warnings'])}")
-        for item in results['warnings']:
-            print(f"  • {item}")
+    if warnings:
+        lines.append(f"\n⚠ Warnings: {len(warnings)}")
+        lines.extend(f"  • {item}" for item in warnings)
     
-    if results['failed']:
-        print(f"\n✗ Failed: {len(results['failed'])}")
-        for item in results['failed']:
-            print(f"  • {item}")
+    if failed:
+        lines.append(f"\n✗ Failed: {len(failed)}")
+        lines.extend(f"  • {item}" for item in failed)
     
-    print("\n" + "=" * 50)
+    lines.append("\n" + "=" * 50)
     
-    if results['failed']:
-        print("\n❌ Some tests failed. Please check the setup.")
-        print("Run setup.sh again or see README.md for troubleshooting.")
-        return 1
-    elif results['warnings']:
-        print("\n⚠️  Setup complete with warnings.")
-        print("The robot should work, but check warnings above.")
-        return 0
+    if failed:
+        lines.append("\n❌ Some tests failed. Please check the setup.")
+        lines.append("Run setup.sh again or see README.md for troubleshooting.")
+        exit_code = 1
+    elif warnings:
+        lines.append("\n⚠️  Setup complete with warnings.")
+        lines.append("The robot should work, but check warnings above.")
+        exit_code = 0
     else:
-        print("\n✅ All tests passed! Robot is ready to use.")
-        print("\nTo start the robot:")
-        print("  python3 src/main.py")
-        return 0
+        lines.append("\n✅ All tests passed! Robot is ready to use.")
+        lines.append("\nTo start the robot:")
+        lines.append("  python3 src/main.py")
+        exit_code = 0
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    return exit_code
 
 
 def main():
     """Run all tests."""
+    parser = argparse.ArgumentParser(description="Verify Digital Waiter Robot setup")
+    parser.add_argument('--fix', action='store_true',
+                        help="create missing logs/ and data/orders/ directories "
+                             "instead of only reporting them")
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("Digital Waiter Robot - Setup Test")
     print("=" * 50)
@@ -256,7 +278,7 @@ def main():
     test_config_files()
     print()
     
-    test_directories()
+    test_directories(fix=args.fix)
     print()
     
     test_models()
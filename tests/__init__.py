@@ -0,0 +1,4 @@
+"""
+Unit tests for the Digital Waiter Robot
+Run from the project root with: python -m unittest discover -s tests -t .
+"""
@@ -0,0 +1,53 @@
+"""
+Tests that the speech grammar vocabulary covers what the intent processor reacts to
+"""
+
+import unittest
+
+from src.intent.processor import IntentProcessor, Intent
+
+
+class TestIntentVocabulary(unittest.TestCase):
+    """IntentProcessor.vocabulary() must cover every intent trigger."""
+    
+    def setUp(self):
+        self.processor = IntentProcessor(menu_items=["Caesar Salad", "Iced Latte"])
+        self.vocabulary = set(self.processor.vocabulary())
+        
+    def test_every_pattern_triggered_by_vocabulary(self):
+        # Some ORDER patterns need a following word, hence the trailing item
+        for intent, patterns in self.processor.intent_patterns.items():
+            for pattern in patterns:
+                self.assertTrue(
+                    any(pattern.search(f"{phrase} latte") for phrase in self.vocabulary),
+                    f"No grammar phrase triggers {intent.value} pattern {pattern.pattern}"
+                )
+                
+    def test_known_trigger_phrases_covered(self):
+        phrases = [
+            "i'll have", "may i have", "take", "what's", "tell me about", "info",
+            "cost", "confirm", "sure", "ok", "finished", "ready", "pay", "checkout",
+            "six", "seven", "eight", "nine", "ten", "hot", "cold", "iced", "the", "me",
+        ]
+        for phrase in phrases:
+            self.assertIn(phrase, self.vocabulary)
+            
+    def test_in_grammar_utterances_detected(self):
+        words = {word for phrase in self.vocabulary for word in phrase.split()}
+        words.update(("caesar", "salad", "latte"))
+        utterances = {
+            "may i have two caesar salad please": Intent.ORDER,
+            "what's good": Intent.SUGGEST,
+            "sure that's right": Intent.CONFIRM,
+            "never mind": Intent.CANCEL,
+            "how much is the iced latte": Intent.INFO,
+            "that's all i'm ready to pay": Intent.DONE,
+        }
+        for text, expected in utterances.items():
+            missing = [word for word in text.split() if word not in words]
+            self.assertEqual(missing, [], f"'{text}' has words outside the grammar")
+            self.assertEqual(self.processor.process(text)['intent'], expected, text)
+
+
+if __name__ == "__main__":
+    unittest.main()